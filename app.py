@@ -5,14 +5,33 @@ Main Streamlit Application
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import orjson
 import os
 from pathlib import Path
-import tempfile
 import time
+from typing import Dict, List
 
 from utils.pdf_parser import extract_text_with_location, extract_text_simple
 from utils.text_processor import segment_sentences, segment_paragraphs, map_sentences_to_blocks, map_paragraphs_to_blocks
-from utils.vagueness_detector import analyze_sentence, analyze_paragraph
+from utils.vagueness_detector import analyze_stream, is_error_result, DEFAULT_REQUESTS_PER_MINUTE
+from utils.result_cache import ResultCache
+from utils.semantic_cache import SemanticCache, gemini_embedder
+from utils.hashing import content_id
+
+# Largest upload accepted for analysis
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+
+# Refresh live metrics/table every this many analyzed units
+LIVE_UPDATE_EVERY = 10
+
+# Number of most recent rows shown in the live results table
+LIVE_TABLE_ROWS = 50
+
+# Parsed documents kept by the loaders below, and how long (seconds) each is kept;
+# the cache is shared by all sessions of the server process
+LOADER_CACHE_ENTRIES = 32
+LOADER_CACHE_TTL = 60 * 60
 
 # Page configuration
 st.set_page_config(
@@ -54,6 +73,12 @@ st.markdown("""
         border-left: 4px solid #28a745;
         margin: 0.5rem 0;
     }
+    .failed-sentence {
+        background-color: #f8d7da;
+        padding: 0.5rem;
+        border-left: 4px solid #dc3545;
+        margin: 0.5rem 0;
+    }
     .analyzing-badge {
         background-color: #17a2b8;
         color: white;
@@ -72,8 +97,6 @@ def initialize_session_state():
         st.session_state.analysis_complete = False
     if 'results_df' not in st.session_state:
         st.session_state.results_df = None
-    if 'pdf_path' not in st.session_state:
-        st.session_state.pdf_path = None
     if 'is_analyzing' not in st.session_state:
         st.session_state.is_analyzing = False
     if 'results_list' not in st.session_state:
@@ -86,24 +109,94 @@ def initialize_session_state():
         st.session_state.api_key = ""
 
 
+@st.cache_data(show_spinner=False, max_entries=LOADER_CACHE_ENTRIES, ttl=LOADER_CACHE_TTL, hash_funcs={bytes: content_id})
+def load_pdf_blocks(pdf_bytes: bytes) -> List[Dict]:
+    """Parse a PDF once per distinct upload; Streamlit reruns reuse the result"""
+    return extract_text_with_location(pdf_bytes)
+
+
+@st.cache_data(show_spinner=False, max_entries=LOADER_CACHE_ENTRIES, ttl=LOADER_CACHE_TTL)
+def load_text_units(full_text: str, use_paragraphs: bool) -> List[str]:
+    """Segment text once per distinct document and analysis mode"""
+    if use_paragraphs:
+        return segment_paragraphs(full_text)
+    return segment_sentences(full_text)
+
+
+def get_analysis_cache() -> ResultCache:
+    """
+    Store of analyses for this session, keyed by text, model and paragraph mode
+    
+    Kept in session state rather than st.cache_resource so one user's
+    results are never served to another and Clear Session drops them;
+    the LRU bound keeps long sessions from growing without limit.
+    """
+    if 'analysis_cache' not in st.session_state:
+        st.session_state.analysis_cache = ResultCache()
+    return st.session_state.analysis_cache
+
+
+def get_semantic_cache(model_name: str, use_paragraphs: bool, api_key: str) -> SemanticCache:
+    """
+    Similarity cache for this session, per model, analysis mode and API key
+    
+    Never shared between sessions: a near-duplicate hit hands back another
+    text's reason and suggestion, and embeddings are billed to the key.
+    """
+    if 'semantic_caches' not in st.session_state:
+        st.session_state.semantic_caches = {}
+    caches = st.session_state.semantic_caches
+    key = (model_name, use_paragraphs, content_id(api_key))
+    if key not in caches:
+        caches[key] = SemanticCache(embed_fn=gemini_embedder(api_key))
+    return caches[key]
+
+
+def build_results_df(results: List[Dict]) -> pd.DataFrame:
+    """Build the results frame, keeping "Is Vague" as a bool column"""
+    df = pd.DataFrame(results)
+    if not df.empty:
+        df["Page"] = df["Page"].astype("int32")
+    return df
+
+
+def display_view(df: pd.DataFrame) -> pd.DataFrame:
+    """Render the bool "Is Vague" and "Failed" columns as one emoji label column for display"""
+    labels = np.select([df["Failed"], df["Is Vague"]], ["⚠️ Failed", "✅ Yes"], default="❌ No")
+    return df.drop(columns="Failed").assign(**{"Is Vague": labels})
+
+
+def summarize(vague_count: int, failed_count: int, total: int):
+    """
+    Count clear items and percentages, leaving failed analyses out of both
+    
+    Returns:
+        Tuple of (clear count, vague percentage, clarity score) over the items that got a verdict
+    """
+    assessed = total - failed_count
+    clear_count = assessed - vague_count
+    vague_pct = (vague_count / assessed * 100) if assessed > 0 else 0
+    clarity_score = (clear_count / assessed * 100) if assessed > 0 else 0
+    return clear_count, vague_pct, clarity_score
+
+
 def process_file(file, file_type):
     """Process uploaded file and extract text"""
     
-    # Create temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_type}") as tmp_file:
-        tmp_file.write(file.getvalue())
-        tmp_path = tmp_file.name
+    # Parse straight from the upload buffer; no temporary file needed
+    file_bytes = file.getvalue()
     
     if file_type == "pdf":
         # Extract text with location data
-        blocks = extract_text_with_location(tmp_path)
-        full_text = " ".join([block["text"] for block in blocks])
-        return full_text, blocks, tmp_path
+        blocks = load_pdf_blocks(file_bytes)
+        # Blank line between blocks so segment_paragraphs sees each block as a paragraph candidate
+        full_text = "\n\n".join(block["text"] for block in blocks)
+        return full_text, blocks
     else:  # txt file
-        full_text = file.getvalue().decode("utf-8")
+        full_text = file_bytes.decode("utf-8")
         # Create dummy blocks for txt files
-        blocks = [{"text": full_text, "page": 1, "bbox": {"x0": 0, "y0": 0, "x1": 0, "y1": 0}}]
-        return full_text, blocks, tmp_path
+        blocks = [{"text": full_text, "page": 1, "bbox": (0, 0, 0, 0)}]
+        return full_text, blocks
 
 
 def main():
@@ -178,6 +271,38 @@ def main():
             help="Flash is faster, Pro is more accurate"
         )
         
+        # Request dispatch selection
+        request_mode = st.radio(
+            "Request Mode",
+            ["Async (Recommended)", "Thread pool"],
+            help="Both send requests concurrently; use Thread pool if async requests fail in your environment"
+        )
+        
+        requests_per_minute = st.number_input(
+            "Requests per minute",
+            min_value=1,
+            value=DEFAULT_REQUESTS_PER_MINUTE,
+            help="Match your Gemini quota (10 on the free tier of gemini-2.5-flash). Requests rejected for exceeding it are retried with backoff"
+        )
+        
+        use_batch_api = st.checkbox(
+            "Use Batch API (cheaper, async)",
+            value=False,
+            help="Submit the whole document as one Gemini batch job. Costs less, but results only appear once the job finishes"
+        )
+        
+        use_prescreen = st.checkbox(
+            "Skip concrete text without hedging cues",
+            value=True,
+            help="Text containing none of the common vague phrases (e.g. 'very', 'some', 'soon', 'might') and at least two numbers is marked clear without calling Gemini"
+        )
+        
+        use_semantic_cache = st.checkbox(
+            "Reuse results for near-duplicate text",
+            value=False,
+            help="Embed each item and reuse the analysis of any earlier item with over 95% similarity. Saves calls on repetitive documents such as contracts"
+        )
+        
         st.divider()
         
         st.header("📋 About")
@@ -243,6 +368,14 @@ def main():
                     st.info("👉 Get your free API key from [Google AI Studio](https://makersuite.google.com/app/apikey)")
                     st.stop()
                 
+                # Reject empty or oversized uploads before reading them
+                if uploaded_file.size == 0:
+                    st.error("❌ The uploaded file is empty.")
+                    st.stop()
+                if uploaded_file.size > MAX_UPLOAD_BYTES:
+                    st.error(f"❌ File is too large ({uploaded_file.size / 1024 / 1024:.1f} MB). The limit is {MAX_UPLOAD_BYTES // 1024 // 1024} MB.")
+                    st.stop()
+                
                 # Reset session state for new analysis
                 st.session_state.results_list = []
                 st.session_state.current_progress = 0
@@ -254,16 +387,14 @@ def main():
                 
                 try:
                     # Process file
-                    full_text, blocks, tmp_path = process_file(uploaded_file, file_type)
-                    st.session_state.pdf_path = tmp_path if file_type == "pdf" else None
+                    full_text, blocks = process_file(uploaded_file, file_type)
                     
                     # Segment into paragraphs or sentences
+                    text_units = load_text_units(full_text, use_paragraphs)
                     if use_paragraphs:
-                        text_units = segment_paragraphs(full_text)
                         unit_name = "paragraph"
                         unit_name_plural = "paragraphs"
                     else:
-                        text_units = segment_sentences(full_text)
                         unit_name = "sentence"
                         unit_name_plural = "sentences"
                     
@@ -277,122 +408,177 @@ def main():
                     else:
                         text_data = map_sentences_to_blocks(text_units, blocks)
                     
-                    st.divider()
-                    st.info(f"🔄 **Analysis in progress... Check results below!**")
-                    
-                    # Create live update containers
-                    progress_container = st.container()
-                    metrics_container = st.container()
-                    table_container = st.container()
-                    latest_container = st.container()
+                    text_units = [unit_info.get("paragraph") or unit_info.get("sentence") for unit_info in text_data]
+                    ordered_results = [None] * len(text_data)
                     
-                    # Progress bar and status
-                    with progress_container:
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
+                    def make_result(i, analysis):
+                        unit_info = text_data[i]
+                        return {
+                            "Text": text_units[i],
+                            "Is Vague": bool(analysis["is_vague"]),
+                            "Failed": bool(is_error_result(analysis)),
+                            "Reason": analysis["reason"],
+                            "Suggestion": analysis["suggestion"],
+                            "Page": unit_info["page"],
+                            "Location": f"Page {unit_info['page']}"
+                        }
                     
-                    # Metrics placeholders
-                    with metrics_container:
-                        col1, col2, col3, col4 = st.columns(4)
-                        metric_analyzed = col1.empty()
-                        metric_vague = col2.empty()
-                        metric_clear = col3.empty()
-                        metric_score = col4.empty()
+                    semantic_cache = None
+                    if use_semantic_cache:
+                        semantic_cache = get_semantic_cache(model_choice, use_paragraphs, st.session_state.api_key)
                     
-                    # Table placeholder
-                    with table_container:
-                        st.subheader("📊 Live Results")
-                        table_placeholder = st.empty()
+                    if use_batch_api:
+                        backend = "batch"
+                    elif "Thread" in request_mode:
+                        backend = "thread"
+                    else:
+                        backend = "async"
                     
-                    # Latest unit placeholder
-                    with latest_container:
-                        st.subheader(f"🔍 Latest Analyzed {unit_name.title()}")
-                        latest_placeholder = st.empty()
+                    analysis_stream = analyze_stream(
+                        text_units,
+                        api_key=st.session_state.api_key,
+                        model_name=model_choice,
+                        use_paragraphs=use_paragraphs,
+                        backend=backend,
+                        use_prescreen=use_prescreen,
+                        cache=get_analysis_cache(),
+                        semantic_cache=semantic_cache,
+                        requests_per_minute=int(requests_per_minute)
+                    )
                     
-                    # Analyze text units with live updates
-                    for i, unit_info in enumerate(text_data):
-                        # Get the text unit (paragraph or sentence)
-                        text_unit = unit_info.get("paragraph") or unit_info.get("sentence")
+                    if use_batch_api:
+                        # One batch job for the whole document; results arrive all at once
+                        with st.spinner(f"⏳ Waiting for Gemini batch job with {len(text_units)} {unit_name_plural}... this can take several minutes"):
+                            for i, analysis in analysis_stream:
+                                ordered_results[i] = make_result(i, analysis)
                         
-                        # Update progress
-                        progress = (i + 1) / len(text_data)
-                        progress_bar.progress(progress)
-                        status_text.info(f"Analyzing {unit_name} {i + 1} of {len(text_data)}...")
+                        st.session_state.current_progress = len(ordered_results)
+                    else:
+                        st.divider()
+                        st.info(f"🔄 **Analysis in progress... Check results below!**")
                         
-                        # Analyze using appropriate function with API key
-                        if use_paragraphs:
-                            analysis = analyze_paragraph(text_unit, api_key=st.session_state.api_key, model_name=model_choice)
-                        else:
-                            analysis = analyze_sentence(text_unit, api_key=st.session_state.api_key, model_name=model_choice)
+                        # Create live update containers
+                        progress_container = st.container()
+                        metrics_container = st.container()
+                        table_container = st.container()
+                        latest_container = st.container()
                         
-                        # Combine results
-                        result = {
-                            "Text": text_unit,
-                            "Is Vague": "✅ Yes" if analysis["is_vague"] else "❌ No",
-                            "Reason": analysis["reason"],
-                            "Suggestion": analysis["suggestion"],
-                            "Page": unit_info["page"],
-                            "Location": f"Page {unit_info['page']}"
-                        }
+                        # Progress bar and status
+                        with progress_container:
+                            progress_bar = st.progress(0)
+                            status_text = st.empty()
                         
-                        # Add to results list
-                        st.session_state.results_list.append(result)
-                        st.session_state.current_progress = i + 1
+                        # Metrics placeholders
+                        with metrics_container:
+                            col1, col2, col3, col4, col5 = st.columns(5)
+                            metric_analyzed = col1.empty()
+                            metric_vague = col2.empty()
+                            metric_clear = col3.empty()
+                            metric_failed = col4.empty()
+                            metric_score = col5.empty()
                         
-                        # Create DataFrame
-                        current_df = pd.DataFrame(st.session_state.results_list)
-                        st.session_state.results_df = current_df
+                        # Table placeholder
+                        with table_container:
+                            st.subheader("📊 Live Results")
+                            table_placeholder = st.empty()
                         
-                        # Update metrics
-                        total = len(current_df)
-                        vague_count = len(current_df[current_df["Is Vague"] == "✅ Yes"])
-                        clear_count = total - vague_count
-                        vague_pct = (vague_count / total * 100) if total > 0 else 0
-                        clarity_score = 100 - vague_pct
+                        # Latest unit placeholder
+                        with latest_container:
+                            st.subheader(f"🔍 Latest Analyzed {unit_name.title()}")
+                            latest_placeholder = st.empty()
                         
-                        metric_analyzed.metric("Analyzed", f"{total}/{len(text_data)}")
-                        metric_vague.metric("Vague", vague_count, delta=f"{vague_pct:.1f}%")
-                        metric_clear.metric("Clear", clear_count)
-                        metric_score.metric("Clarity", f"{clarity_score:.1f}%")
+                        # Analyze text units concurrently with live updates
+                        vague_count = 0
+                        failed_count = 0
                         
-                        # Update table
-                        table_placeholder.dataframe(
-                            current_df,
-                            use_container_width=True,
-                            height=300,
-                            column_config={
-                                "Text": st.column_config.TextColumn(unit_name.title(), width="large"),
-                                "Is Vague": st.column_config.TextColumn("Vague?", width="small"),
-                                "Reason": st.column_config.TextColumn("Reason", width="medium"),
-                                "Suggestion": st.column_config.TextColumn("Suggestion", width="medium"),
-                                "Page": st.column_config.NumberColumn("Page", width="small"),
-                            }
-                        )
+                        def handle_result(i, analysis):
+                            nonlocal vague_count, failed_count
+                            text_unit = text_units[i]
+                            done = st.session_state.current_progress + 1
                         
-                        # Update latest text unit - show more text for paragraphs
-                        preview_length = 300 if use_paragraphs else 200
-                        text_preview = text_unit[:preview_length]
-                        if len(text_unit) > preview_length:
-                            text_preview += "..."
+                            # Update progress
+                            progress = done / len(text_data)
+                            progress_bar.progress(progress)
+                            status_text.info(f"Analyzed {unit_name} {done} of {len(text_data)}...")
                         
-                        if result["Is Vague"] == "✅ Yes":
-                            latest_placeholder.markdown(
-                                f'<div class="vague-sentence"><strong>"{text_preview}"</strong><br>'
-                                f'<em>❌ Vague - {result["Reason"]}</em><br>'
-                                f'<small>Page {result["Page"]}</small></div>', 
-                                unsafe_allow_html=True
-                            )
-                        else:
-                            latest_placeholder.markdown(
-                                f'<div class="clear-sentence"><strong>"{text_preview}"</strong><br>'
-                                f'<em>✅ Clear and precise</em><br>'
-                                f'<small>Page {result["Page"]}</small></div>', 
-                                unsafe_allow_html=True
+                            # Combine results
+                            result = make_result(i, analysis)
+                        
+                            # Add to results list (completion order for the live view)
+                            ordered_results[i] = result
+                            st.session_state.results_list.append(result)
+                            st.session_state.current_progress = done
+                            if result["Failed"]:
+                                failed_count += 1
+                            elif result["Is Vague"]:
+                                vague_count += 1
+                            
+                            # Refresh the live view every few results and on the last one
+                            if done % LIVE_UPDATE_EVERY and done < len(text_data):
+                                return
+                        
+                            # Update metrics from running counts
+                            total = done
+                            clear_count, vague_pct, clarity_score = summarize(vague_count, failed_count, total)
+                        
+                            metric_analyzed.metric("Analyzed", f"{total}/{len(text_data)}")
+                            metric_vague.metric("Vague", vague_count, delta=f"{vague_pct:.1f}%")
+                            metric_clear.metric("Clear", clear_count)
+                            metric_failed.metric("Failed", failed_count)
+                            metric_score.metric("Clarity", f"{clarity_score:.1f}%")
+                        
+                            # Update table with the most recent rows; the Results tab has the full frame
+                            table_placeholder.dataframe(
+                                display_view(pd.DataFrame(st.session_state.results_list[-LIVE_TABLE_ROWS:])),
+                                use_container_width=True,
+                                height=300,
+                                column_config={
+                                    "Text": st.column_config.TextColumn(unit_name.title(), width="large"),
+                                    "Is Vague": st.column_config.TextColumn("Vague?", width="small"),
+                                    "Reason": st.column_config.TextColumn("Reason", width="medium"),
+                                    "Suggestion": st.column_config.TextColumn("Suggestion", width="medium"),
+                                    "Page": st.column_config.NumberColumn("Page", width="small"),
+                                }
                             )
-                    
-                    # Clear progress indicators
-                    progress_bar.empty()
-                    status_text.empty()
+                        
+                            # Update latest text unit - show more text for paragraphs
+                            preview_length = 300 if use_paragraphs else 200
+                            text_preview = text_unit[:preview_length]
+                            if len(text_unit) > preview_length:
+                                text_preview += "..."
+                        
+                            if result["Failed"]:
+                                latest_placeholder.markdown(
+                                    f'<div class="failed-sentence"><strong>"{text_preview}"</strong><br>'
+                                    f'<em>⚠️ Analysis failed - {result["Reason"]}</em><br>'
+                                    f'<small>Page {result["Page"]}</small></div>', 
+                                    unsafe_allow_html=True
+                                )
+                            elif result["Is Vague"]:
+                                latest_placeholder.markdown(
+                                    f'<div class="vague-sentence"><strong>"{text_preview}"</strong><br>'
+                                    f'<em>❌ Vague - {result["Reason"]}</em><br>'
+                                    f'<small>Page {result["Page"]}</small></div>', 
+                                    unsafe_allow_html=True
+                                )
+                            else:
+                                latest_placeholder.markdown(
+                                    f'<div class="clear-sentence"><strong>"{text_preview}"</strong><br>'
+                                    f'<em>✅ Clear and precise</em><br>'
+                                    f'<small>Page {result["Page"]}</small></div>', 
+                                    unsafe_allow_html=True
+                                )
+                        
+                        for i, analysis in analysis_stream:
+                            handle_result(i, analysis)
+                        
+                        # Clear progress indicators
+                        progress_bar.empty()
+                        status_text.empty()
+                        
+                    # Restore document order for the Results tab and exports
+                    st.session_state.results_list = ordered_results
+                    st.session_state.results_df = build_results_df(ordered_results)
                     
                     # Mark analysis as complete
                     st.session_state.analysis_complete = True
@@ -421,12 +607,12 @@ def main():
             st.markdown("---")
             
             # Summary metrics
-            col1, col2, col3, col4 = st.columns(4)
+            col1, col2, col3, col4, col5 = st.columns(5)
             
             total_sentences = len(df)
-            vague_count = len(df[df["Is Vague"] == "✅ Yes"])
-            clear_count = total_sentences - vague_count
-            vague_percentage = (vague_count / total_sentences * 100) if total_sentences > 0 else 0
+            failed_count = int(df["Failed"].sum())
+            vague_count = int((df["Is Vague"] & ~df["Failed"]).sum())
+            clear_count, vague_percentage, clarity_score = summarize(vague_count, failed_count, total_sentences)
             
             with col1:
                 st.metric("Total Analyzed", total_sentences)
@@ -435,9 +621,13 @@ def main():
             with col3:
                 st.metric("Clear Items", clear_count)
             with col4:
-                clarity_score = 100 - vague_percentage
+                st.metric("Failed Items", failed_count)
+            with col5:
                 st.metric("Clarity Score", f"{clarity_score:.1f}%")
             
+            if failed_count:
+                st.warning(f"⚠️ {failed_count} items could not be analyzed and are left out of the scores. Use the 'Failed Only' filter to review them.")
+            
             st.divider()
             
             # Filter options
@@ -446,15 +636,17 @@ def main():
             with col1:
                 filter_option = st.selectbox(
                     "Filter Results",
-                    ["All Items", "Vague Only", "Clear Only"],
+                    ["All Items", "Vague Only", "Clear Only", "Failed Only"],
                     key="filter_selector"
                 )
             
             # Apply filter
             if filter_option == "Vague Only":
-                filtered_df = df[df["Is Vague"] == "✅ Yes"]
+                filtered_df = df[df["Is Vague"] & ~df["Failed"]]
             elif filter_option == "Clear Only":
-                filtered_df = df[df["Is Vague"] == "❌ No"]
+                filtered_df = df[~df["Is Vague"] & ~df["Failed"]]
+            elif filter_option == "Failed Only":
+                filtered_df = df[df["Failed"]]
             else:
                 filtered_df = df
             
@@ -465,7 +657,7 @@ def main():
             text_col_name = "Text" if "Text" in filtered_df.columns else "Sentence"
             
             st.dataframe(
-                filtered_df,
+                display_view(filtered_df),
                 use_container_width=True,
                 height=400,
                 column_config={
@@ -495,7 +687,10 @@ def main():
                 )
             
             with col2:
-                json_str = filtered_df.to_json(orient='records', indent=2)
+                json_str = orjson.dumps(
+                    filtered_df.to_dict(orient="records"),
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                )
                 st.download_button(
                     label="📋 Download as JSON",
                     data=json_str,
@@ -509,23 +704,28 @@ def main():
                 text_col_name = "Text" if "Text" in df.columns else "Sentence"
                 unit_type = "Paragraphs" if "Text" in df.columns else "Sentences"
                 
-                summary = f"""# Vagueness Analysis Report
+                header = f"""# Vagueness Analysis Report
 
 ## Summary
 - Total {unit_type}: {total_sentences}
 - Vague {unit_type}: {vague_count} ({vague_percentage:.1f}%)
 - Clear {unit_type}: {clear_count}
+- Failed {unit_type}: {failed_count}
 - Clarity Score: {clarity_score:.1f}%
 
 ## Vague {unit_type} Found:
 
 """
-                for idx, row in df[df["Is Vague"] == "✅ Yes"].iterrows():
-                    summary += f"\n### Item (Page {row['Page']})\n"
-                    summary += f"**Text:** {row[text_col_name]}\n\n"
-                    summary += f"**Reason:** {row['Reason']}\n\n"
-                    summary += f"**Suggestion:** {row['Suggestion']}\n\n"
-                    summary += "---\n"
+                vague_rows = df.loc[df["Is Vague"] & ~df["Failed"], ["Page", text_col_name, "Reason", "Suggestion"]]
+                parts = [
+                    f"\n### Item (Page {page})\n"
+                    f"**Text:** {text}\n\n"
+                    f"**Reason:** {reason}\n\n"
+                    f"**Suggestion:** {suggestion}\n\n"
+                    "---\n"
+                    for page, text, reason, suggestion in vague_rows.itertuples(index=False, name=None)
+                ]
+                summary = header + "".join(parts)
                 
                 st.download_button(
                     label="📝 Download Report (MD)",
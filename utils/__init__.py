@@ -3,16 +3,19 @@ Utility modules for vague language detection system
 """
 
 from .pdf_parser import extract_text_with_location
-from .vagueness_detector import analyze_sentence, analyze_paragraph, analyze_batch
-from .text_processor import segment_sentences, segment_paragraphs, map_paragraphs_to_blocks, create_context_window
+from .vagueness_detector import analyze_sentence, analyze_paragraph, analyze_batch, iter_analyze_batch
+from .text_processor import segment_sentences, iter_sentences, segment_paragraphs, map_paragraphs_to_blocks, create_context_window, create_context_windows
 
 __all__ = [
     'extract_text_with_location',
     'analyze_sentence',
     'analyze_paragraph',
     'analyze_batch',
+    'iter_analyze_batch',
     'segment_sentences',
+    'iter_sentences',
     'segment_paragraphs',
     'map_paragraphs_to_blocks',
-    'create_context_window'
+    'create_context_window',
+    'create_context_windows'
 ]
@@ -0,0 +1,31 @@
+"""
+Hashing Module
+Fast, stable content IDs for cache keys
+"""
+
+from typing import Union
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+    import hashlib
+
+
+def content_id(data: Union[bytes, str]) -> int:
+    """
+    Compute a stable 64-bit ID for a piece of content
+
+    Uses xxh3 when the xxhash package is installed, otherwise blake2b.
+
+    Args:
+        data: Raw bytes, or text (hashed as UTF-8)
+
+    Returns:
+        Integer content ID, identical across runs and processes
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
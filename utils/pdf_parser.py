@@ -4,42 +4,81 @@ Extracts text from PDF files with precise location tracking
 """
 
 import fitz  # PyMuPDF
-from typing import List, Dict, Tuple
+from pathlib import Path
+from typing import List, Dict, Tuple, Union
 
+from .process_pool import new_process_pool
 
-def extract_text_with_location(pdf_path: str) -> List[Dict]:
+# Documents with at least this many pages are parsed across worker processes
+PARALLEL_PAGE_THRESHOLD = 64
+
+# Pages handed to a worker per task, to amortize inter-process overhead
+PAGES_PER_TASK = 8
+
+# Document opened once per worker process by _init_worker
+_worker_document = None
+
+
+def _open_document(pdf_source: Union[str, bytes]) -> fitz.Document:
+    """Open a PDF from a file path or from its raw bytes"""
+    if isinstance(pdf_source, (bytes, bytearray)):
+        return fitz.open(stream=pdf_source, filetype="pdf")
+    return fitz.open(pdf_source)
+
+
+def _page_blocks(page: fitz.Page, page_no: int) -> List[Dict]:
+    """Get the non-empty text blocks of one page with position information"""
+    return [
+        {"page": page_no, "text": text, "bbox": block[:4]}
+        for block in page.get_text("blocks")
+        if (text := block[4].strip())
+    ]
+
+
+def _init_worker(pdf_bytes: bytes):
+    """Open the document once in each worker process"""
+    global _worker_document
+    _worker_document = fitz.open(stream=pdf_bytes, filetype="pdf")
+
+
+def _parse_page(page_no: int) -> List[Dict]:
+    """Extract the text blocks of a single (1-based) page in a worker process"""
+    return _page_blocks(_worker_document[page_no - 1], page_no)
+
+
+def extract_text_with_location(pdf_source: Union[str, bytes]) -> List[Dict]:
     """
     Extract text from PDF with page numbers and bounding box coordinates
     
     Args:
-        pdf_path: Path to the PDF file
+        pdf_source: Path to the PDF file, or its raw bytes
         
     Returns:
-        List of dictionaries containing text, page number, and bbox coordinates
+        List of dictionaries containing text, page number, and bbox
+        coordinates as an (x0, y0, x1, y1) tuple
     """
     data = []
     
     try:
-        with fitz.open(pdf_path) as doc:
-            for page_no, page in enumerate(doc, start=1):
-                # Get text blocks with position information
-                blocks = page.get_text("blocks")
-                
-                for block in blocks:
-                    text = block[4].strip()
-                    
-                    # Only add non-empty text blocks
-                    if text:
-                        data.append({
-                            "page": page_no,
-                            "text": text,
-                            "bbox": {
-                                "x0": block[0],
-                                "y0": block[1],
-                                "x1": block[2],
-                                "y1": block[3]
-                            }
-                        })
+        with _open_document(pdf_source) as doc:
+            page_count = len(doc)
+            
+            if page_count < PARALLEL_PAGE_THRESHOLD:
+                for page_no, page in enumerate(doc, start=1):
+                    data.extend(_page_blocks(page, page_no))
+                return data
+        
+        # Long documents: parse pages in parallel, passing the bytes to each worker once
+        if isinstance(pdf_source, (bytes, bytearray)):
+            pdf_bytes = bytes(pdf_source)
+        else:
+            pdf_bytes = Path(pdf_source).read_bytes()
+        
+        # Each worker holds its own copy of the bytes, so the pool is kept small
+        tasks = -(-page_count // PAGES_PER_TASK)
+        with new_process_pool(tasks, initializer=_init_worker, initargs=(pdf_bytes,)) as executor:
+            for page_data in executor.map(_parse_page, range(1, page_count + 1), chunksize=PAGES_PER_TASK):
+                data.extend(page_data)
         
         return data
     
@@ -47,18 +86,18 @@ def extract_text_with_location(pdf_path: str) -> List[Dict]:
         raise Exception(f"Error extracting text from PDF: {str(e)}")
 
 
-def extract_text_simple(pdf_path: str) -> str:
+def extract_text_simple(pdf_source: Union[str, bytes]) -> str:
     """
     Extract all text from PDF as a single string
     
     Args:
-        pdf_path: Path to the PDF file
+        pdf_source: Path to the PDF file, or its raw bytes
         
     Returns:
         Complete text content of the PDF
     """
     try:
-        with fitz.open(pdf_path) as doc:
+        with _open_document(pdf_source) as doc:
             text = ""
             for page in doc:
                 text += page.get_text()
@@ -68,18 +107,18 @@ def extract_text_simple(pdf_path: str) -> str:
         raise Exception(f"Error extracting text from PDF: {str(e)}")
 
 
-def get_pdf_page_count(pdf_path: str) -> int:
+def get_pdf_page_count(pdf_source: Union[str, bytes]) -> int:
     """
     Get the total number of pages in a PDF
     
     Args:
-        pdf_path: Path to the PDF file
+        pdf_source: Path to the PDF file, or its raw bytes
         
     Returns:
         Number of pages
     """
     try:
-        with fitz.open(pdf_path) as doc:
+        with _open_document(pdf_source) as doc:
             return len(doc)
     except Exception as e:
         raise Exception(f"Error reading PDF: {str(e)}")
@@ -0,0 +1,31 @@
+"""
+Process Pool Module
+Worker pools for CPU-bound parsing, safe to start from the Streamlit server
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Upper bound on worker processes per pool, whatever the core count
+MAX_POOL_WORKERS = 4
+
+
+def new_process_pool(tasks: int, **kwargs) -> ProcessPoolExecutor:
+    """
+    Create a process pool with no more workers than there are tasks
+
+    Workers are started with forkserver (spawn where that is unavailable)
+    rather than fork: the Streamlit server is multithreaded, and forking a
+    multithreaded process can deadlock the child.
+
+    Args:
+        tasks: Number of tasks that will be submitted
+        **kwargs: Extra ProcessPoolExecutor arguments, e.g. initializer and initargs
+
+    Returns:
+        A ProcessPoolExecutor, to be used as a context manager
+    """
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    workers = max(1, min(MAX_POOL_WORKERS, os.cpu_count() or 1, tasks))
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method), **kwargs)
@@ -0,0 +1,90 @@
+"""
+Result Cache Module
+Bounded store of analyses for exact repeats of the same text
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .hashing import content_id
+
+# Analyses kept before the least recently used ones are evicted
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of analyses keyed by text hash, model and mode
+
+    Texts are hashed into the key so entries stay small. Error fallbacks
+    (results flagged with "error") are never stored, so a later run
+    retries them, and lookups hand out copies so callers can mutate
+    results freely.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            max_entries: Maximum number of analyses kept
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(text: str, model_name: str, use_paragraphs: bool, context: str = "") -> Tuple:
+        """
+        Build the cache key of an analysis
+
+        Args:
+            text: The analyzed text
+            model_name: Gemini model used
+            use_paragraphs: True for paragraph analysis, False for sentence analysis
+            context: Context the sentence was analyzed with, if any
+
+        Returns:
+            Hashable key
+        """
+        return content_id(text), content_id(context) if context else None, model_name, use_paragraphs
+
+    def get(self, key: Tuple) -> Optional[Dict]:
+        """
+        Look up an analysis
+
+        Args:
+            key: Key built by key()
+
+        Returns:
+            A copy of the cached analysis, or None on a miss
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                return None
+            self._entries.move_to_end(key)
+            return dict(result)
+
+    def put(self, key: Tuple, result: Dict):
+        """
+        Store an analysis, unless it is an error fallback
+
+        Args:
+            key: Key built by key()
+            result: The analysis
+        """
+        if result.get("error"):
+            return
+        with self._lock:
+            self._entries[key] = dict(result)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every stored analysis"""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,232 @@
+"""
+Semantic Cache Module
+Reuses analyses for paragraphs that are near-duplicates of ones already analyzed
+"""
+
+import google.ai.generativelanguage as glm
+import google.generativeai as genai
+import numpy as np
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .hashing import content_id
+
+# Gemini embedding model used for similarity lookups
+EMBEDDING_MODEL = "models/text-embedding-004"
+
+# Maximum number of texts per embedding request
+EMBEDDING_BATCH_SIZE = 100
+
+# Cosine similarity above which two texts share an analysis
+DEFAULT_THRESHOLD = 0.95
+
+
+def gemini_embedder(api_key: str) -> Callable[[List[str]], np.ndarray]:
+    """
+    Create an embedding function backed by the Gemini embedding API
+
+    Args:
+        api_key: Google Gemini API key
+
+    Returns:
+        Function mapping a list of texts to a (len(texts), dim) array
+    """
+    # A client bound to this key, rather than genai.configure(), which is process-wide
+    client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+
+    def embed(texts: List[str]) -> np.ndarray:
+        vectors = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            response = genai.embed_content(
+                model=EMBEDDING_MODEL,
+                content=texts[start:start + EMBEDDING_BATCH_SIZE],
+                task_type="semantic_similarity",
+                client=client
+            )
+            vectors.extend(response["embedding"])
+        return np.asarray(vectors, dtype=np.float32)
+
+    return embed
+
+
+class SemanticCache:
+    """
+    Cache of analyses looked up by embedding similarity
+
+    Embeddings are stored L2-normalized in one matrix, so a lookup is a
+    single matrix-vector product followed by an argmax. Texts seen before
+    verbatim are found by content ID without embedding them at all.
+    Stored state is guarded by a lock; embedding and compute calls run
+    outside it.
+    """
+
+    def __init__(self, embed_fn: Callable[[List[str]], np.ndarray], threshold: float = DEFAULT_THRESHOLD):
+        """
+        Args:
+            embed_fn: Function mapping a list of texts to an array of embeddings
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._results: List[Dict] = []
+        # Content ID of each stored text -> its analysis
+        self._exact: Dict[int, Dict] = {}
+        # Embeddings computed by assign(), kept until the matching add()
+        self._pending: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.asarray(self.embed_fn(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _search(self, vector: np.ndarray) -> Optional[Dict]:
+        if self._size == 0:
+            return None
+        scores = np.dot(self._matrix[:self._size], vector)
+        best = int(np.argmax(scores))
+        return self._results[best] if scores[best] > self.threshold else None
+
+    def _append(self, text: str, vector: np.ndarray, result: Dict):
+        self._exact[content_id(text)] = result
+        if self._matrix is None:
+            self._matrix = np.empty((16, vector.shape[0]), dtype=np.float32)
+        elif self._size == len(self._matrix):
+            # Grow geometrically so appends stay amortized O(1)
+            grown = np.empty((2 * len(self._matrix), self._matrix.shape[1]), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+        self._matrix[self._size] = vector
+        self._results.append(result)
+        self._size += 1
+
+    def lookup(self, text: str) -> Optional[Dict]:
+        """
+        Find the analysis of a similar text, if any
+
+        Args:
+            text: Text to look up
+
+        Returns:
+            The cached analysis, or None on a miss
+        """
+        with self._lock:
+            exact = self._exact.get(content_id(text))
+        if exact is not None:
+            return exact
+        vector = self._embed([text])[0]
+        with self._lock:
+            return self._search(vector)
+
+    def add(self, text: str, result: Dict):
+        """
+        Store the analysis of a text
+
+        Args:
+            text: The analyzed text
+            result: Its analysis
+        """
+        with self._lock:
+            vector = self._pending.pop(text, None)
+        if vector is None:
+            vector = self._embed([text])[0]
+        with self._lock:
+            self._append(text, vector, result)
+
+    def discard(self, text: str):
+        """
+        Forget the embedding assign() kept for a text that will not be stored
+
+        Args:
+            text: Text passed to assign() whose analysis failed or was abandoned
+        """
+        with self._lock:
+            self._pending.pop(text, None)
+
+    def get_or_compute(self, text: str, compute_fn: Callable[[str], Dict]) -> Dict:
+        """
+        Return the analysis of a similar cached text, or compute and store a new one
+
+        Args:
+            text: Text to analyze
+            compute_fn: Function producing the analysis on a cache miss
+
+        Returns:
+            Analysis result
+        """
+        with self._lock:
+            result = self._exact.get(content_id(text))
+        if result is not None:
+            return result
+
+        vector = self._embed([text])[0]
+        with self._lock:
+            result = self._search(vector)
+        if result is None:
+            result = compute_fn(text)
+            with self._lock:
+                self._append(text, vector, result)
+        return result
+
+    def assign(self, texts: List[str]) -> Tuple[Dict[int, Dict], Dict[int, int]]:
+        """
+        Match a list of texts against the cache and against each other
+
+        Texts not already stored verbatim are embedded in one pass. A text that is similar to an
+        earlier text in the same list is aliased to it, so only the first
+        of each group needs analyzing. Texts left unmatched should be
+        analyzed and then stored with add(), or released with discard()
+        if their analysis fails.
+
+        Args:
+            texts: Texts about to be analyzed
+
+        Returns:
+            Tuple of (hits, aliases): hits maps a text index to a cached
+            analysis, aliases maps a text index to the index of the earlier
+            text whose analysis it should reuse
+        """
+        hits = {}
+        aliases = {}
+
+        # Verbatim repeats of stored texts need no embedding
+        to_embed = []
+        with self._lock:
+            for i, text in enumerate(texts):
+                exact = self._exact.get(content_id(text))
+                if exact is not None:
+                    hits[i] = exact
+                else:
+                    to_embed.append(i)
+
+        if not to_embed:
+            return hits, aliases
+
+        vectors = self._embed([texts[i] for i in to_embed])
+        representatives = np.empty_like(vectors)
+        representative_indices = []
+
+        with self._lock:
+            for i, vector in zip(to_embed, vectors):
+                cached = self._search(vector)
+                if cached is not None:
+                    hits[i] = cached
+                    continue
+
+                if representative_indices:
+                    scores = np.dot(representatives[:len(representative_indices)], vector)
+                    best = int(np.argmax(scores))
+                    if scores[best] > self.threshold:
+                        aliases[i] = representative_indices[best]
+                        continue
+
+                representatives[len(representative_indices)] = vector
+                representative_indices.append(i)
+                self._pending[texts[i]] = vector
+
+        return hits, aliases
@@ -4,14 +4,127 @@ Handles paragraph and sentence segmentation
 """
 
 import nltk
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional, Tuple
 import re
+from bisect import bisect_right
+from collections import deque
+from itertools import accumulate
+
+from .process_pool import new_process_pool
 
-# Download required NLTK data
 try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+    import blingfire
+except ImportError:
+    blingfire = None
+
+# Texts longer than this are sentence-tokenized in parallel chunks
+PARALLEL_TOKENIZE_CHARS = 200_000
+
+# Approximate size of each chunk handed to a worker process
+TOKENIZE_CHUNK_CHARS = 100_000
+
+# Leading characters of a unit used to locate it in the block text
+MATCH_PREFIX_CHARS = 64
+
+# Paragraph separator (blank line)
+_PARA_SPLIT_RE = re.compile(r'\n\s*\n')
+
+# Blank line that contains whitespace, which plain "\n\n" splitting would miss
+_find_padded_blank_line = re.compile(r'\n[^\S\n]+\n').search
+
+_sent_tokenizer = None
+
+
+def _get_sent_tokenizer():
+    """
+    Return the English Punkt sentence tokenizer, loading it once per process
+    
+    Loaded on first use rather than at import, since paragraph
+    segmentation of well-structured text never needs it.
+    """
+    global _sent_tokenizer
+    if _sent_tokenizer is not None:
+        return _sent_tokenizer
+    
+    try:
+        from nltk.tokenize import PunktTokenizer
+    except ImportError:
+        # Older NLTK releases ship the Punkt model as a pickle
+        PunktTokenizer = None
+    
+    # Download required NLTK data
+    resource = 'punkt_tab' if PunktTokenizer is not None else 'punkt'
+    try:
+        nltk.data.find(f'tokenizers/{resource}')
+    except LookupError:
+        nltk.download(resource)
+    
+    if PunktTokenizer is not None:
+        _sent_tokenizer = PunktTokenizer('english')
+    else:
+        _sent_tokenizer = nltk.data.load('tokenizers/punkt/english.pickle')
+    return _sent_tokenizer
+
+
+def _split_into_chunks(text: str, chunk_chars: int = TOKENIZE_CHUNK_CHARS) -> List[str]:
+    """
+    Split text into chunks of at most chunk_chars, cutting at a paragraph
+    break or sentence end where possible so no sentence spans two chunks
+    """
+    chunks = []
+    start = 0
+    
+    while len(text) - start > chunk_chars:
+        end = start + chunk_chars
+        cut = text.rfind("\n\n", start, end)
+        if cut <= start:
+            cut = text.rfind(". ", start, end) + 1
+        if cut <= start:
+            cut = end
+        chunks.append(text[start:cut])
+        start = cut
+    
+    chunks.append(text[start:])
+    return chunks
+
+
+def _tokenize_chunk(chunk: str) -> List[str]:
+    """Sentence-tokenize one chunk (runs in a worker process)"""
+    return _get_sent_tokenizer().tokenize(chunk)
+
+
+def _iter_sent_tokenize(text: str) -> Iterator[str]:
+    """
+    Split text into sentences, yielding each one as soon as it is found
+    
+    Uses blingfire's native segmenter when it is installed. Otherwise
+    Punkt, spreading very large documents over several processes since
+    Punkt is pure Python.
+    """
+    if blingfire is not None:
+        for sentence in blingfire.text_to_sentences(text).split("\n"):
+            if sentence:
+                yield sentence
+        return
+    
+    if len(text) < PARALLEL_TOKENIZE_CHARS:
+        # span_tokenize is lazy, unlike tokenize, which builds the whole list first
+        for start, end in _get_sent_tokenizer().span_tokenize(text):
+            yield text[start:end]
+        return
+    
+    # Fetch the Punkt data here first, so the workers don't all download it at once
+    _get_sent_tokenizer()
+    
+    chunks = _split_into_chunks(text)
+    with new_process_pool(len(chunks)) as executor:
+        for chunk_sentences in executor.map(_tokenize_chunk, chunks):
+            yield from chunk_sentences
+
+
+def _sent_tokenize(text: str) -> List[str]:
+    """Split text into a list of sentences"""
+    return list(_iter_sent_tokenize(text))
 
 
 def segment_paragraphs(text: str, min_length: int = 50) -> List[str]:
@@ -25,36 +138,38 @@ def segment_paragraphs(text: str, min_length: int = 50) -> List[str]:
     Returns:
         List of paragraphs
     """
-    # Split by double newlines (common paragraph separator)
-    paragraphs = re.split(r'\n\s*\n', text)
+    # Split by double newlines (common paragraph separator); the regex is
+    # only needed when blank lines carry stray whitespace
+    if _find_padded_blank_line(text) is None:
+        paragraphs = text.split("\n\n")
+    else:
+        paragraphs = _PARA_SPLIT_RE.split(text)
     
     # Clean up paragraphs
     cleaned_paragraphs = []
-    buffer = ""
+    buffer = []
     
     for para in paragraphs:
         # Remove extra whitespace
-        para = re.sub(r'\s+', ' ', para).strip()
+        para = " ".join(para.split())
         
         # Skip empty paragraphs
         if len(para) < 10:
             continue
         
         # If paragraph is too short, combine with buffer
-        if len(para) < min_length and buffer:
-            buffer += " " + para
-        elif len(para) < min_length:
-            buffer = para
+        if len(para) < min_length:
+            buffer.append(para)
         else:
             # Add buffer if exists
             if buffer:
-                cleaned_paragraphs.append(buffer)
-                buffer = ""
+                cleaned_paragraphs.append(" ".join(buffer))
+                buffer = []
             cleaned_paragraphs.append(para)
     
     # Add remaining buffer
     if buffer:
-        cleaned_paragraphs.append(buffer)
+        cleaned_paragraphs.append(" ".join(buffer))
     
     # If no paragraphs found (single block of text), split by sentences
     if len(cleaned_paragraphs) == 0 or (len(cleaned_paragraphs) == 1 and len(cleaned_paragraphs[0]) > 1000):
@@ -75,48 +190,59 @@ def segment_by_length(text: str, target_length: int = 500) -> List[str]:
     Returns:
         List of text chunks
     """
-    sentences = nltk.sent_tokenize(text)
+    sentences = _sent_tokenize(text)
     chunks = []
-    current_chunk = ""
+    # Sentences of the current chunk and the length of their space-joined text
+    current_parts = []
+    current_length = 0
     
     for sentence in sentences:
         # If adding this sentence exceeds target, save current chunk
-        if len(current_chunk) + len(sentence) > target_length and current_chunk:
-            chunks.append(current_chunk.strip())
-            current_chunk = sentence
+        if current_length + len(sentence) > target_length and current_parts:
+            chunks.append(" ".join(current_parts).strip())
+            current_parts = [sentence]
+            current_length = len(sentence)
         else:
-            current_chunk += " " + sentence if current_chunk else sentence
+            current_length += len(sentence) + 1 if current_parts else len(sentence)
+            current_parts.append(sentence)
     
     # Add remaining chunk
-    if current_chunk:
-        chunks.append(current_chunk.strip())
+    if current_parts:
+        chunks.append(" ".join(current_parts).strip())
     
     return chunks
 
 
-def segment_sentences(text: str) -> List[str]:
+def iter_sentences(text: str) -> Iterator[str]:
     """
-    Segment text into individual sentences
+    Segment text into individual sentences, yielding each one as it is found
     
     Args:
         text: Input text to segment
         
-    Returns:
-        List of sentences
+    Yields:
+        Cleaned sentences in document order
     """
     # Use NLTK's sentence tokenizer
-    sentences = nltk.sent_tokenize(text)
-    
-    # Clean up sentences
-    cleaned_sentences = []
-    for sent in sentences:
+    for sent in _iter_sent_tokenize(text):
         # Remove extra whitespace
-        sent = re.sub(r'\s+', ' ', sent).strip()
+        sent = " ".join(sent.split())
         # Only include sentences with meaningful content
         if len(sent) > 10:  # Minimum sentence length
-            cleaned_sentences.append(sent)
+            yield sent
+
+
+def segment_sentences(text: str) -> List[str]:
+    """
+    Segment text into individual sentences
     
-    return cleaned_sentences
+    Args:
+        text: Input text to segment
+        
+    Returns:
+        List of sentences
+    """
+    return list(iter_sentences(text))
 
 
 def create_context_window(sentences: List[str], index: int, window_size: int = 2) -> Dict[str, str]:
@@ -151,45 +277,135 @@ def create_context_window(sentences: List[str], index: int, window_size: int = 2
     }
 
 
-def map_paragraphs_to_blocks(paragraphs: List[str], blocks: List[Dict]) -> List[Dict]:
+def create_context_windows(sentences: List[str], window_size: int = 2) -> List[Dict[str, str]]:
     """
-    Map paragraphs back to their PDF blocks for location tracking
+    Create the context window of every sentence in one pass
+    
+    Equivalent to calling create_context_window for each index, but the
+    neighbouring sentences are kept in two rolling windows instead of
+    being sliced out of the list again for every sentence.
+    
+    Args:
+        sentences: List of all sentences
+        window_size: Number of sentences before/after to include
+        
+    Returns:
+        List of dictionaries with previous, current, and next context, one per sentence
+    """
+    total = len(sentences)
+    previous = deque(maxlen=window_size)
+    following = deque(sentences[1:window_size + 1], maxlen=window_size)
+    windows = []
+    
+    for index, current in enumerate(sentences):
+        windows.append({
+            "previous": " ".join(previous),
+            "current": current,
+            "next": " ".join(following)
+        })
+        
+        # Slide both windows one sentence forward
+        previous.append(current)
+        if following:
+            following.popleft()
+        if index + window_size + 1 < total:
+            following.append(sentences[index + window_size + 1])
+    
+    return windows
+
+
+def _build_block_index(blocks: List[Dict]) -> Tuple[str, List[int]]:
+    """
+    Join the whitespace-normalized block texts and record where each block starts
     
     Args:
-        paragraphs: List of paragraphs
         blocks: List of text blocks with location data from PDF
         
     Returns:
-        List of paragraphs with their page numbers and bounding boxes
+        Tuple of (joined text, start offset of each block in the joined text)
+    """
+    texts = [" ".join(block["text"].split()) for block in blocks]
+    starts = [0]
+    starts.extend(accumulate(len(text) + 1 for text in texts[:-1]))
+    return " ".join(texts), starts
+
+
+def _map_units_to_blocks(units: List[str], blocks: List[Dict], key: str, prefix_length: Optional[int] = None) -> List[Dict]:
+    """
+    Map text units back to the block each one starts in
+    
+    Each unit is searched for in the joined block text, continuing from
+    the previous match since units come in document order, and its offset
+    is turned into a block with a binary search over block start offsets.
+    The search cursor only moves forward: a unit found only by searching
+    again from the start is placed there without rewinding the cursor.
+    Units that begin exactly where a block begins are looked up by prefix
+    without searching at all.
+    
+    Args:
+        units: Text units in document order
+        blocks: List of text blocks with location data from PDF
+        key: Name of the text field in the returned dictionaries
+        prefix_length: Only match this many leading characters of each unit
+        
+    Returns:
+        List of units with their page numbers and bounding boxes
     """
-    paragraph_data = []
+    if not blocks:
+        return []
     
-    for paragraph in paragraphs:
-        # Find which block this paragraph starts in
-        found = False
+    joined, starts = _build_block_index(blocks)
+    unit_data = []
+    cursor = 0
+    
+    # Leading characters of each block -> first block starting with them
+    block_by_prefix = {}
+    if prefix_length:
+        for i, start in enumerate(starts):
+            block_by_prefix.setdefault(joined[start:start + prefix_length], i)
+    
+    for unit in units:
+        probe = unit[:prefix_length] if prefix_length else unit
+        i = block_by_prefix.get(probe)
+        if i is not None and starts[i] >= cursor:
+            position = starts[i]
+        else:
+            position = joined.find(probe, cursor)
         
-        # Try to find the paragraph in blocks
-        para_start = paragraph[:50]  # First 50 chars for matching
+        if position >= 0:
+            # Stay at the match, not past it, since the next unit may start in the same block
+            cursor = position + 1
+        else:
+            position = joined.find(probe)
         
-        for block in blocks:
-            if para_start in block["text"] or block["text"] in paragraph:
-                paragraph_data.append({
-                    "paragraph": paragraph,
-                    "page": block["page"],
-                    "bbox": block["bbox"]
-                })
-                found = True
-                break
+        if position >= 0:
+            block = blocks[bisect_right(starts, position) - 1]
+        else:
+            # If not found in any block, assign to first block (fallback)
+            block = blocks[0]
         
-        # If not found in any block, assign to first block (fallback)
-        if not found and blocks:
-            paragraph_data.append({
-                "paragraph": paragraph,
-                "page": blocks[0]["page"],
-                "bbox": blocks[0]["bbox"]
-            })
+        unit_data.append({
+            key: unit,
+            "page": block["page"],
+            "bbox": block["bbox"]
+        })
     
-    return paragraph_data
+    return unit_data
+
+
+def map_paragraphs_to_blocks(paragraphs: List[str], blocks: List[Dict]) -> List[Dict]:
+    """
+    Map paragraphs back to their PDF blocks for location tracking
+    
+    Args:
+        paragraphs: List of paragraphs
+        blocks: List of text blocks with location data from PDF
+        
+    Returns:
+        List of paragraphs with their page numbers and bounding boxes
+    """
+    # First 50 chars for matching; merged short paragraphs may not be contiguous
+    return _map_units_to_blocks(paragraphs, blocks, "paragraph", prefix_length=50)
 
 
 def map_sentences_to_blocks(sentences: List[str], blocks: List[Dict]) -> List[Dict]:
@@ -203,30 +419,4 @@ def map_sentences_to_blocks(sentences: List[str], blocks: List[Dict]) -> List[Di
     Returns:
         List of sentences with their page numbers and bounding boxes
     """
-    sentence_data = []
-    
-    # Combine all block texts
-    all_text = " ".join([block["text"] for block in blocks])
-    
-    for sentence in sentences:
-        # Find which block this sentence belongs to
-        found = False
-        for block in blocks:
-            if sentence in block["text"]:
-                sentence_data.append({
-                    "sentence": sentence,
-                    "page": block["page"],
-                    "bbox": block["bbox"]
-                })
-                found = True
-                break
-        
-        # If not found in any block, assign to first block (fallback)
-        if not found and blocks:
-            sentence_data.append({
-                "sentence": sentence,
-                "page": blocks[0]["page"],
-                "bbox": blocks[0]["bbox"]
-            })
-    
-    return sentence_data
+    return _map_units_to_blocks(sentences, blocks, "sentence", prefix_length=MATCH_PREFIX_CHARS)
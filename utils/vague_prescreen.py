@@ -0,0 +1,127 @@
+"""
+Vague Phrase Prescreen Module
+Cheap local check for hedging cues before sending text to Gemini
+"""
+
+import re
+from typing import Dict, Optional
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Words and phrases that typically signal vague or imprecise language
+VAGUE_PHRASES = [
+    # Subjective qualifiers and intensifiers
+    "very", "quite", "somewhat", "rather", "fairly", "highly", "extremely",
+    "significant", "significantly", "substantial", "substantially", "considerable", "considerably",
+    "much", "adequate", "adequately", "reasonable", "reasonably", "appropriate", "appropriately",
+    "sufficient", "sufficiently", "satisfactory", "suitable", "acceptable",
+    # Imprecise quantifiers
+    "many", "several", "some", "few", "various", "numerous", "a number of", "a lot of",
+    "majority", "approximately", "roughly", "etc",
+    # Vague time references
+    "soon", "recently", "shortly", "promptly", "timely", "in due course", "in the near future",
+    "for a while", "some time", "as soon as possible", "from time to time", "periodically",
+    # Hedging language
+    "might", "could", "possibly", "potentially", "probably", "likely", "perhaps",
+    "generally", "usually", "often", "typically", "normally", "where practicable",
+    "if necessary", "as necessary", "as required", "as appropriate", "best efforts",
+    # Comparatives without baselines
+    "better", "faster", "more efficient", "improved",
+    # Unclear references
+    "and/or",
+]
+
+# Numbers a cue-free text needs before the prescreen clears it, so only
+# clearly concrete text (figures, measurements, tables) skips Gemini
+MIN_NUMBERS = 2
+
+# A number, counting "3.5" or "1,200" as one
+_NUMBER_RE = re.compile(r'\d+(?:[.,]\d+)*')
+
+# Result used for text the prescreen clears
+CLEAR_RESULT = {
+    "is_vague": False,
+    "reason": "No hedging cues detected and specific figures given",
+    "suggestion": ""
+}
+
+
+def _build_automaton():
+    automaton = ahocorasick.Automaton()
+    for phrase in VAGUE_PHRASES:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
+
+
+if ahocorasick is not None:
+    _AUTOMATON = _build_automaton()
+else:
+    _AUTOMATON = None
+    # Longest phrases first so multi-word cues win over their prefixes
+    _PHRASE_RE = re.compile(
+        r'\b(?:' + '|'.join(re.escape(p) for p in sorted(VAGUE_PHRASES, key=len, reverse=True)) + r')\b'
+    )
+
+
+def has_vague_cue(text: str) -> bool:
+    """
+    Check whether text contains any known vague phrase
+
+    Args:
+        text: Text to check
+
+    Returns:
+        True if at least one whole-word vague phrase occurs in the text
+    """
+    lowered = text.lower()
+
+    if _AUTOMATON is None:
+        return _PHRASE_RE.search(lowered) is not None
+
+    # Aho-Corasick matches substrings, so reject hits inside longer words
+    for end, phrase in _AUTOMATON.iter(lowered):
+        start = end - len(phrase) + 1
+        if (start == 0 or not lowered[start - 1].isalnum()) and (end + 1 == len(lowered) or not lowered[end + 1].isalnum()):
+            return True
+    return False
+
+
+def has_numbers(text: str, count: int) -> bool:
+    """
+    Check whether text contains at least `count` numbers
+
+    Args:
+        text: Text to check
+        count: Minimum number of numeric tokens
+
+    Returns:
+        True once `count` numbers have been found
+    """
+    found = 0
+    for _ in _NUMBER_RE.finditer(text):
+        found += 1
+        if found >= count:
+            return True
+    return count <= 0
+
+
+def prescreen(text: str, min_numbers: int = MIN_NUMBERS) -> Optional[Dict]:
+    """
+    Return a local 'clear' verdict for concrete text without hedging cues
+
+    Args:
+        text: Text to check
+        min_numbers: Numbers the text must also contain
+
+    Returns:
+        A copy of CLEAR_RESULT, or None if the text needs a full analysis
+    """
+    if has_vague_cue(text):
+        return None
+    if min_numbers and not has_numbers(text, min_numbers):
+        return None
+    return dict(CLEAR_RESULT)
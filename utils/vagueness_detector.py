@@ -3,29 +3,71 @@ Vagueness Detection Module
 Uses Google Gemini API to detect and explain vague language
 """
 
-import google.generativeai as genai
-import json
-from typing import Dict, List
+import asyncio
+import functools
+import io
+import orjson
+import queue
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from .result_cache import ResultCache
+from .vague_prescreen import prescreen
 
-def analyze_paragraph(paragraph: str, api_key: str, model_name: str = "gemini-2.5-flash") -> Dict:
-    """
-    Analyze a paragraph for vagueness using Gemini
-    
-    Args:
-        paragraph: The paragraph to analyze
-        api_key: Google Gemini API key
-        model_name: Gemini model to use
-        
-    Returns:
-        Dictionary with analysis results
-    """
-    
-    # Configure API key for this request
-    genai.configure(api_key=api_key)
-    
-    # Create the prompt for paragraph analysis
-    prompt = f"""You are an expert linguist evaluating clarity and precision in academic and technical writing.
+# Requests go through the google-genai SDK, whose clients each carry their own API key
+from google import genai as genai_client
+from google.genai import errors as genai_errors
+from google.genai import types as genai_types
+
+# Gemini quotas are counted in requests per minute (10 on the free tier of
+# gemini-2.5-flash, far more on paid tiers); request starts are paced to this
+# rate and anything rejected beyond it is retried with backoff
+DEFAULT_REQUESTS_PER_MINUTE = 60
+
+# Maximum number of Gemini requests in flight at once
+DEFAULT_CONCURRENCY = 10
+
+# Worker threads for the thread-pool fallback
+DEFAULT_MAX_WORKERS = 10
+
+# HTTP statuses worth retrying: rate limited, or the service briefly unavailable
+RETRY_STATUS_CODES = {429, 500, 503}
+
+# Retries of one request before its error is returned as the result
+MAX_RETRIES = 5
+
+# Seconds before the first retry; doubled for each further attempt, up to RETRY_MAX_DELAY
+RETRY_BASE_DELAY = 2
+RETRY_MAX_DELAY = 60
+
+# Terminal states of a Gemini batch job
+BATCH_DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+# Seconds between status checks of a Gemini batch job
+BATCH_POLL_INTERVAL = 10
+
+# Ways analyze_stream can send requests to Gemini
+BACKENDS = ("async", "thread", "batch")
+
+# Longest paragraph sent to Gemini as-is; longer ones (tables, reference lists) are truncated
+MAX_PARAGRAPH_CHARS = 4000
+
+# Analyses remembered by analyze_paragraph, analyze_sentence and analyze_batch across calls
+_memo = ResultCache()
+
+
+# Optional markdown code fence around the JSON in a response; the closing fence may be missing
+_JSON_FENCE_RE = re.compile(r'^```(?:json)?\s*(.*?)\s*(?:```\s*)?$', re.S)
+
+# Bound once at import; every response goes through it
+_loads = orjson.loads
+
+# Prompts are assembled from fixed parts around the text, so the static text is built once
+_PARA_PROMPT_PREFIX = """You are an expert linguist evaluating clarity and precision in academic and technical writing.
 
 Task:
 Analyze the following paragraph and determine if it contains vague, unclear, or imprecise language.
@@ -40,7 +82,9 @@ A paragraph is considered vague if it contains:
 - Comparative statements without baselines (e.g., "more efficient", "better performance")
 
 Paragraph to analyze:
-"{paragraph}"
+\""""
+
+_PARA_PROMPT_SUFFIX = """"
 
 Instructions:
 1. Identify if this paragraph contains vague or imprecise language
@@ -48,45 +92,307 @@ Instructions:
 3. Suggest concrete ways to make it more precise (e.g., add specific numbers, metrics, or references)
 
 Respond ONLY with valid JSON in this exact format:
-{{"is_vague": true or false, "reason": "detailed explanation of what is vague", "suggestion": "specific improvements with examples"}}
+{"is_vague": true or false, "reason": "detailed explanation of what is vague", "suggestion": "specific improvements with examples"}
 
 If the paragraph is clear and precise with concrete details, metrics, or specific information, mark is_vague as false."""
 
-    try:
-        model = genai.GenerativeModel(model_name)
-        response = model.generate_content(prompt)
-        
-        # Extract JSON from response
-        response_text = response.text.strip()
-        
-        # Remove markdown code blocks if present
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+_SENT_PROMPT_PREFIX = """You are an expert linguist evaluating clarity in academic and technical writing.
+
+Task:
+1. Identify if the sentence below is vague, unclear, or imprecise.
+2. If vague, explain WHY it is vague in 1-2 clear lines.
+3. Suggest a more precise alternative.
+
+A sentence is considered vague if it contains:
+- Subjective qualifiers without metrics (e.g., "very good", "quite fast", "somewhat better")
+- Unclear pronouns or references
+- Ambiguous quantifiers (e.g., "many", "several", "some")
+- Imprecise time references (e.g., "soon", "recently", "for a while")
+- Hedging language without justification (e.g., "might", "possibly", "could be")
+
+Sentence: \""""
+
+_SENT_PROMPT_RESPONSE_FORMAT = """
+
+Respond ONLY with valid JSON in this exact format:
+{"is_vague": true or false, "reason": "explanation here", "suggestion": "improved version here"}"""
+
+# The context line sits between the sentence and the response format; without context it is left empty
+_SENT_SUFFIX_WITH_CTX = '"\nContext: '
+_SENT_SUFFIX_NO_CTX = '"\n' + _SENT_PROMPT_RESPONSE_FORMAT
+
+
+def _build_paragraph_prompt(paragraph: str) -> str:
+    """Create the prompt for paragraph analysis"""
+    if len(paragraph) > MAX_PARAGRAPH_CHARS:
+        paragraph = paragraph[:MAX_PARAGRAPH_CHARS] + " …[truncated]"
+    return _PARA_PROMPT_PREFIX + paragraph + _PARA_PROMPT_SUFFIX
+
+
+def _build_sentence_prompt(sentence: str, context: str = "") -> str:
+    """Create the prompt for sentence analysis"""
+    if context:
+        return "".join((_SENT_PROMPT_PREFIX, sentence, _SENT_SUFFIX_WITH_CTX, context, _SENT_PROMPT_RESPONSE_FORMAT))
+    return _SENT_PROMPT_PREFIX + sentence + _SENT_SUFFIX_NO_CTX
+
+
+def _parse_response(response_text: str) -> Dict:
+    """
+    Parse the JSON verdict returned by Gemini
+    
+    Args:
+        response_text: Raw response text from the model
         
-        # Parse JSON
-        result = json.loads(response_text)
+    Returns:
+        Dictionary with analysis results
         
-        return {
-            "is_vague": result.get("is_vague", False),
-            "reason": result.get("reason", "No reason provided"),
-            "suggestion": result.get("suggestion", "No suggestion provided")
-        }
-    
-    except json.JSONDecodeError as e:
-        return {
-            "is_vague": False,
-            "reason": f"Error parsing response: {str(e)}",
-            "suggestion": paragraph
-        }
+    Raises:
+        orjson.JSONDecodeError: If the response is not valid JSON
+    """
+    # Extract JSON from response
+    response_text = response_text.strip()
+    
+    # Remove markdown code blocks if present
+    fenced = _JSON_FENCE_RE.match(response_text)
+    if fenced:
+        response_text = fenced.group(1)
+    
+    # Parse JSON
+    get = _loads(response_text).get
+    
+    # The model occasionally returns null or non-string fields; keep the text fields strings
+    reason = get("reason")
+    suggestion = get("suggestion")
+    return {
+        "is_vague": get("is_vague", False),
+        "reason": "No reason provided" if reason is None else str(reason),
+        "suggestion": "No suggestion provided" if suggestion is None else str(suggestion)
+    }
+
+
+def _error_result(reason: str, text: str) -> Dict:
+    """Build the fallback result returned when analysis fails"""
+    return {
+        "is_vague": False,
+        "reason": reason,
+        "suggestion": text,
+        "error": True
+    }
+
+
+def _no_text_reason(chunk) -> str:
+    """Explain why a google-genai response chunk carried no text"""
+    feedback = chunk.prompt_feedback
+    if feedback is not None and feedback.block_reason:
+        return f"Prompt blocked: {getattr(feedback.block_reason, 'name', feedback.block_reason)}"
+    if chunk.candidates and chunk.candidates[0].finish_reason:
+        reason = chunk.candidates[0].finish_reason
+        return f"Response carried no text (finish reason: {getattr(reason, 'name', reason)})"
+    return "Response carried no text"
+
+
+def _chunk_text(chunk, failures: List[ValueError]) -> str:
+    """
+    Text of one streamed response chunk
+    
+    Chunks without text (metadata only, or a blocked candidate) count as
+    empty, and the SDK's explanation is appended to failures.
+    """
+    text = chunk.text
+    if text is None:
+        failures.append(ValueError(_no_text_reason(chunk)))
+        return ""
+    return text
+
+
+def _parse_received(received: List[str]) -> Optional[Dict]:
+    """Try to parse the verdict from the response text streamed so far"""
+    try:
+        return _parse_response("".join(received))
+    except orjson.JSONDecodeError:
+        return None
+
+
+def _parse_stream_end(received: List[str], failures: List[ValueError]) -> Dict:
+    """Parse the complete streamed response, or raise why it carried no text"""
+    response_text = "".join(received)
+    if failures and not response_text.strip():
+        # e.g. a safety block: report the SDK's reason, not an empty-input parse error
+        raise failures[-1]
+    return _parse_response(response_text)
+
+
+class _RateLimiter:
+    """
+    Spaces request starts evenly so no more than requests_per_minute begin per minute
+    
+    Shared by every request of a run, from threads or from one event loop.
+    """
+    
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60.0 / requests_per_minute
+        self._next_start = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Claim the next start slot and return the seconds to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+            return start - now
+    
+    def wait(self):
+        time.sleep(self._reserve())
+    
+    async def wait_async(self):
+        await asyncio.sleep(self._reserve())
+
+
+def _should_retry(error: Exception, attempt: int) -> bool:
+    """Check whether a failed request is a rate limit or outage worth another attempt"""
+    return attempt < MAX_RETRIES and isinstance(error, genai_errors.APIError) and error.code in RETRY_STATUS_CODES
+
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, so throttled requests don't retry in lockstep"""
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def _stream_verdict(client: "genai_client.Client", model_name: str, prompt: str) -> Dict:
+    """
+    Stream a response and return the verdict as soon as it parses
+    
+    A parse is attempted whenever a chunk contains a closing brace, and
+    the rest of the stream is abandoned once the JSON object is complete.
+    
+    Raises:
+        orjson.JSONDecodeError: If the full response is not valid JSON
+        ValueError: If no chunk carried text, e.g. the response was blocked
+    """
+    received = []
+    failures = []
+    for chunk in client.models.generate_content_stream(model=model_name, contents=prompt):
+        text = _chunk_text(chunk, failures)
+        received.append(text)
+        if "}" in text:
+            result = _parse_received(received)
+            if result is not None:
+                return result
+    return _parse_stream_end(received, failures)
+
+
+async def _stream_verdict_async(aio: "genai_client.client.AsyncClient", model_name: str, prompt: str) -> Dict:
+    """Asynchronous counterpart of _stream_verdict"""
+    received = []
+    failures = []
+    async for chunk in await aio.models.generate_content_stream(model=model_name, contents=prompt):
+        text = _chunk_text(chunk, failures)
+        received.append(text)
+        if "}" in text:
+            result = _parse_received(received)
+            if result is not None:
+                return result
+    return _parse_stream_end(received, failures)
+
+
+def _generate_verdict(client: "genai_client.Client", model_name: str, prompt: str, limiter: Optional[_RateLimiter] = None) -> Dict:
+    """
+    Get the verdict for a prompt, retrying rate limit and availability errors with backoff
+    
+    Args:
+        client: Client bound to the caller's API key
+        model_name: Gemini model to use
+        prompt: Complete prompt
+        limiter: Optional rate limiter every attempt waits on
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        if limiter is not None:
+            limiter.wait()
+        try:
+            return _stream_verdict(client, model_name, prompt)
+        except Exception as e:
+            if not _should_retry(e, attempt):
+                raise
+        time.sleep(_retry_delay(attempt))
+
+
+async def _generate_verdict_async(aio: "genai_client.client.AsyncClient", model_name: str, prompt: str, limiter: Optional[_RateLimiter] = None) -> Dict:
+    """Asynchronous counterpart of _generate_verdict"""
+    for attempt in range(MAX_RETRIES + 1):
+        if limiter is not None:
+            await limiter.wait_async()
+        try:
+            return await _stream_verdict_async(aio, model_name, prompt)
+        except Exception as e:
+            if not _should_retry(e, attempt):
+                raise
+        await asyncio.sleep(_retry_delay(attempt))
+
+
+@functools.lru_cache(maxsize=8)
+def _get_client(api_key: str) -> "genai_client.Client":
+    """
+    Build the client for an API key once
+    
+    Each client is bound to its own key, unlike genai.configure(), which
+    swaps the key of every model in the process, so concurrent sessions
+    with different keys cannot bill each other.
+    """
+    return genai_client.Client(api_key=api_key)
+
+
+def _analyze_paragraph_with_client(paragraph: str, client: "genai_client.Client", model_name: str, limiter: Optional[_RateLimiter] = None) -> Dict:
+    """Analyze a paragraph using an existing client"""
+    prompt = _build_paragraph_prompt(paragraph)
+
+    try:
+        return _generate_verdict(client, model_name, prompt, limiter)
+    
+    except orjson.JSONDecodeError as e:
+        return _error_result(f"Error parsing response: {str(e)}", paragraph)
+    
+    except Exception as e:
+        return _error_result(f"Error analyzing paragraph: {str(e)}", paragraph)
+
+
+def _analyze_sentence_with_client(sentence: str, client: "genai_client.Client", model_name: str, context: str = "", limiter: Optional[_RateLimiter] = None) -> Dict:
+    """Analyze a sentence using an existing client"""
+    prompt = _build_sentence_prompt(sentence, context)
+
+    try:
+        return _generate_verdict(client, model_name, prompt, limiter)
+    
+    except orjson.JSONDecodeError as e:
+        return _error_result(f"Error parsing response: {str(e)}", sentence)
     
     except Exception as e:
-        return {
-            "is_vague": False,
-            "reason": f"Error analyzing paragraph: {str(e)}",
-            "suggestion": paragraph
-        }
+        return _error_result(f"Error analyzing sentence: {str(e)}", sentence)
+
+
+def is_error_result(result: Dict) -> bool:
+    """Check whether a result is an error fallback rather than a real verdict"""
+    return result.get("error", False)
+
+
+def analyze_paragraph(paragraph: str, api_key: str, model_name: str = "gemini-2.5-flash") -> Dict:
+    """
+    Analyze a paragraph for vagueness using Gemini
+    
+    Args:
+        paragraph: The paragraph to analyze
+        api_key: Google Gemini API key
+        model_name: Gemini model to use
+        
+    Returns:
+        Dictionary with analysis results
+    """
+    key = ResultCache.key(paragraph, model_name, True)
+    result = _memo.get(key)
+    if result is None:
+        result = _analyze_paragraph_with_client(paragraph, _get_client(api_key), model_name)
+        _memo.put(key, result)
+    return result
 
 
 def analyze_sentence(sentence: str, api_key: str, context: str = "", model_name: str = "gemini-2.5-flash") -> Dict:
@@ -102,92 +408,501 @@ def analyze_sentence(sentence: str, api_key: str, context: str = "", model_name:
     Returns:
         Dictionary with analysis results
     """
+    key = ResultCache.key(sentence, model_name, False, context)
+    result = _memo.get(key)
+    if result is None:
+        result = _analyze_sentence_with_client(sentence, _get_client(api_key), model_name, context)
+        _memo.put(key, result)
+    return result
+
+
+async def _analyze_paragraph_async(paragraph: str, aio: "genai_client.client.AsyncClient", model_name: str, limiter: Optional[_RateLimiter] = None) -> Dict:
+    """Asynchronous counterpart of analyze_paragraph using an existing async client"""
+    prompt = _build_paragraph_prompt(paragraph)
+
+    try:
+        return await _generate_verdict_async(aio, model_name, prompt, limiter)
     
-    # Configure API key for this request
-    genai.configure(api_key=api_key)
+    except orjson.JSONDecodeError as e:
+        return _error_result(f"Error parsing response: {str(e)}", paragraph)
     
-    # Create the prompt
-    prompt = f"""You are an expert linguist evaluating clarity in academic and technical writing.
+    except Exception as e:
+        return _error_result(f"Error analyzing paragraph: {str(e)}", paragraph)
 
-Task:
-1. Identify if the sentence below is vague, unclear, or imprecise.
-2. If vague, explain WHY it is vague in 1-2 clear lines.
-3. Suggest a more precise alternative.
 
-A sentence is considered vague if it contains:
-- Subjective qualifiers without metrics (e.g., "very good", "quite fast", "somewhat better")
-- Unclear pronouns or references
-- Ambiguous quantifiers (e.g., "many", "several", "some")
-- Imprecise time references (e.g., "soon", "recently", "for a while")
-- Hedging language without justification (e.g., "might", "possibly", "could be")
+async def _analyze_sentence_async(sentence: str, aio: "genai_client.client.AsyncClient", model_name: str, context: str = "", limiter: Optional[_RateLimiter] = None) -> Dict:
+    """Asynchronous counterpart of analyze_sentence using an existing async client"""
+    prompt = _build_sentence_prompt(sentence, context)
 
-Sentence: "{sentence}"
-{f'Context: {context}' if context else ''}
+    try:
+        return await _generate_verdict_async(aio, model_name, prompt, limiter)
+    
+    except orjson.JSONDecodeError as e:
+        return _error_result(f"Error parsing response: {str(e)}", sentence)
+    
+    except Exception as e:
+        return _error_result(f"Error analyzing sentence: {str(e)}", sentence)
 
-Respond ONLY with valid JSON in this exact format:
-{{"is_vague": true or false, "reason": "explanation here", "suggestion": "improved version here"}}"""
 
+async def analyze_all(units: List[str], api_key: str, model_name: str = "gemini-2.5-flash", use_paragraphs: bool = True, concurrency: int = DEFAULT_CONCURRENCY, requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE) -> AsyncIterator[Tuple[int, Dict]]:
+    """
+    Analyze all text units concurrently, yielding results as they complete
+    
+    Args:
+        units: List of text items to analyze
+        api_key: Google Gemini API key
+        model_name: Gemini model to use
+        use_paragraphs: If True, use paragraph analysis; if False, use sentence analysis
+        concurrency: Maximum number of requests in flight at once
+        requests_per_minute: Maximum number of requests started per minute
+        
+    Yields:
+        Tuples of (original index, analysis result) in completion order
+    """
+    # A fresh client per run: it is bound to this key, and its connections to
+    # the event loop it is first used on, so it is not shared through _get_client
+    aio = genai_client.Client(api_key=api_key).aio
+    
+    analyze_func = _analyze_paragraph_async if use_paragraphs else _analyze_sentence_async
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = _RateLimiter(requests_per_minute)
+    
+    async def _bounded(index: int, unit: str) -> Tuple[int, Dict]:
+        async with semaphore:
+            return index, await analyze_func(unit, aio, model_name, limiter=limiter)
+    
+    tasks = [asyncio.create_task(_bounded(i, unit)) for i, unit in enumerate(units)]
+    
     try:
-        model = genai.GenerativeModel(model_name)
-        response = model.generate_content(prompt)
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Don't leave requests running if the consumer stops early
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await aio.aclose()
+
+
+def analyze_batch_threaded(
+    units: Iterable[str],
+    api_key: str,
+    model_name: str = "gemini-2.5-flash",
+    use_paragraphs: bool = True,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    cache: Optional[ResultCache] = None,
+    requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE
+) -> Iterator[Tuple[int, Dict]]:
+    """
+    Analyze text units on a thread pool, yielding results as they complete
+    
+    Units are submitted as they are read, without waiting for earlier
+    results, so the network waits overlap and the units may come from a
+    lazy iterable. Results that finish in the meantime are handed back
+    between submissions.
+    
+    Args:
+        units: Text items to analyze, as a list or any iterable
+        api_key: Google Gemini API key
+        model_name: Gemini model to use
+        use_paragraphs: If True, use paragraph analysis; if False, use sentence analysis
+        max_workers: Number of worker threads (requests in flight at once)
+        cache: Optional ResultCache; cached units are yielded without a request
+            and new results are stored in it
+        requests_per_minute: Maximum number of requests started per minute
         
-        # Extract JSON from response
-        response_text = response.text.strip()
+    Yields:
+        Tuples of (original index, analysis result) in completion order
+    """
+    # One client bound to this key, shared by the worker threads
+    client = _get_client(api_key)
+    limiter = _RateLimiter(requests_per_minute)
+    
+    analyze_func = _analyze_paragraph_with_client if use_paragraphs else _analyze_sentence_with_client
+    
+    # Futures land here as they finish
+    finished = queue.Queue()
+    futures = {}
+    
+    def _collect(future) -> Tuple[int, Dict]:
+        i, key = futures.pop(future)
+        result = future.result()
+        if cache is not None:
+            cache.put(key, result)
+        return i, result
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for i, unit in enumerate(units):
+                key = None
+                if cache is not None:
+                    key = ResultCache.key(unit, model_name, use_paragraphs)
+                    cached = cache.get(key)
+                    if cached is not None:
+                        yield i, cached
+                        continue
+                
+                future = executor.submit(analyze_func, unit, client, model_name, limiter=limiter)
+                futures[future] = (i, key)
+                future.add_done_callback(finished.put)
+                
+                while not finished.empty():
+                    yield _collect(finished.get_nowait())
+            
+            while futures:
+                yield _collect(finished.get())
+        finally:
+            # Drop queued work if the consumer stops early
+            for future in futures:
+                future.cancel()
+
+
+def submit_batch(units: List[str], api_key: str, model_name: str = "gemini-2.5-flash", use_paragraphs: bool = True) -> str:
+    """
+    Submit all text units as a single Gemini batch job
+    
+    Args:
+        units: List of text items to analyze
+        api_key: Google Gemini API key
+        model_name: Gemini model to use
+        use_paragraphs: If True, use paragraph prompts; if False, use sentence prompts
         
-        # Remove markdown code blocks if present
-        if response_text.startswith("```"):
-            response_text = response_text.split("```")[1]
-            if response_text.startswith("json"):
-                response_text = response_text[4:]
+    Returns:
+        Name of the created batch job, to be passed to poll_batch
+    """
+    build_prompt = _build_paragraph_prompt if use_paragraphs else _build_sentence_prompt
+    
+    # One JSONL record per unit; the key is the unit's index in the document
+    records = b"\n".join(
+        orjson.dumps({
+            "key": str(i),
+            "request": {"contents": [{"role": "user", "parts": [{"text": build_prompt(unit)}]}]}
+        })
+        for i, unit in enumerate(units)
+    )
+    
+    client = _get_client(api_key)
+    uploaded = client.files.upload(
+        file=io.BytesIO(records),
+        config=genai_types.UploadFileConfig(display_name="vagueness-analysis", mime_type="jsonl")
+    )
+    job = client.batches.create(
+        model=model_name,
+        src=uploaded.name,
+        config={"display_name": "vagueness-analysis"}
+    )
+    return job.name
+
+
+def poll_batch(job_id: str, api_key: str, units: List[str]) -> Optional[List[Dict]]:
+    """
+    Check a batch job and collect its results once it has finished
+    
+    Args:
+        job_id: Batch job name returned by submit_batch
+        api_key: Google Gemini API key
+        units: The text items that were submitted, in the same order
         
-        # Parse JSON
-        result = json.loads(response_text)
+    Returns:
+        List of analysis results in input order, or None while the job is still running
+    """
+    client = _get_client(api_key)
+    job = client.batches.get(name=job_id)
+    state = job.state.name
+    
+    if state not in BATCH_DONE_STATES:
+        return None
+    
+    if state != "JOB_STATE_SUCCEEDED":
+        raise Exception(f"Batch job ended with state {state}")
+    
+    results = [_error_result("Error analyzing item: no response returned by batch job", unit) for unit in units]
+    content = client.files.download(file=job.dest.file_name)
+    
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        
+        record = _loads(line)
+        i = int(record["key"])
         
-        return {
-            "is_vague": result.get("is_vague", False),
-            "reason": result.get("reason", "No reason provided"),
-            "suggestion": result.get("suggestion", "No suggestion provided")
-        }
-    
-    except json.JSONDecodeError as e:
-        return {
-            "is_vague": False,
-            "reason": f"Error parsing response: {str(e)}",
-            "suggestion": sentence
-        }
+        if "response" not in record:
+            results[i] = _error_result(f"Error analyzing item: {record.get('error')}", units[i])
+            continue
+        
+        try:
+            response_text = record["response"]["candidates"][0]["content"]["parts"][0]["text"]
+            results[i] = _parse_response(response_text)
+        except orjson.JSONDecodeError as e:
+            results[i] = _error_result(f"Error parsing response: {str(e)}", units[i])
+        except (KeyError, IndexError) as e:
+            results[i] = _error_result(f"Error analyzing item: missing {str(e)} in response", units[i])
     
-    except Exception as e:
-        return {
-            "is_vague": False,
-            "reason": f"Error analyzing sentence: {str(e)}",
-            "suggestion": sentence
-        }
+    return results
+
+
+def _iterate_in_background(make_stream: Callable[[], AsyncIterator[Any]]) -> Iterator[Any]:
+    """
+    Run an async stream on its own event loop in a background thread and
+    iterate over it synchronously, so requests keep being issued while the
+    consumer is busy with the previous item
+    """
+    results = queue.Queue()
+    stop = threading.Event()
+    done = object()
+    
+    async def pump():
+        try:
+            async for item in make_stream():
+                results.put((False, item))
+                if stop.is_set():
+                    break
+        except Exception as e:
+            results.put((True, e))
+        finally:
+            results.put((False, done))
+    
+    threading.Thread(target=asyncio.run, args=(pump(),), daemon=True).start()
+    
+    try:
+        while True:
+            failed, item = results.get()
+            if failed:
+                raise item
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def _iterate_batch(units: List[str], api_key: str, model_name: str, use_paragraphs: bool) -> Iterator[Tuple[int, Dict]]:
+    """Run units through one batch job and yield its results once it finishes"""
+    job_id = submit_batch(units, api_key=api_key, model_name=model_name, use_paragraphs=use_paragraphs)
+    results = poll_batch(job_id, api_key, units)
+    while results is None:
+        time.sleep(BATCH_POLL_INTERVAL)
+        results = poll_batch(job_id, api_key, units)
+    yield from enumerate(results)
+
 
+def _with_aliases(i: int, aliases: Dict[int, List[int]]) -> List[int]:
+    """Get a unit index followed by every unit reusing its result"""
+    indices = [i]
+    for alias in aliases.get(i, []):
+        indices.extend(_with_aliases(alias, aliases))
+    return indices
 
-def analyze_batch(items: List[str], api_key: str, progress_callback=None, model_name: str = "gemini-2.5-flash", use_paragraphs: bool = True) -> List[Dict]:
+
+def analyze_stream(
+    units: List[str],
+    api_key: str,
+    model_name: str = "gemini-2.5-flash",
+    use_paragraphs: bool = True,
+    backend: str = "async",
+    use_prescreen: bool = False,
+    cache: Optional[ResultCache] = None,
+    semantic_cache=None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE
+) -> Iterator[Tuple[int, Dict]]:
+    """
+    Analyze text units, yielding each result as soon as it is available
+    
+    Units are resolved locally where possible before anything is sent to
+    Gemini: prescreened as clear, found in the cache, or matched to an
+    identical or (with a semantic cache) similar unit. The remaining units
+    go through the chosen backend and their results are fanned back out.
+    
+    Args:
+        units: List of text items to analyze
+        api_key: Google Gemini API key
+        model_name: Gemini model to use
+        use_paragraphs: If True, use paragraph analysis; if False, use sentence analysis
+        backend: "async", "thread" or "batch"
+        use_prescreen: Mark clearly concrete units (see vague_prescreen.prescreen) as clear without calling Gemini
+        cache: Optional ResultCache of earlier results
+        semantic_cache: Optional SemanticCache for near-duplicate reuse
+        concurrency: Maximum number of requests in flight with the async backend
+        max_workers: Number of worker threads with the thread backend
+        requests_per_minute: Maximum number of requests started per minute with the async and thread backends
+        
+    Yields:
+        Tuples of (index into units, analysis result), one per unit, in completion order
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    
+    resolved = {}
+    
+    # Clearly concrete units are marked clear locally
+    if use_prescreen:
+        for i, unit in enumerate(units):
+            verdict = prescreen(unit)
+            if verdict is not None:
+                resolved[i] = verdict
+    
+    # Reuse analyses of identical units from earlier runs
+    if cache is not None:
+        cache_keys = [ResultCache.key(unit, model_name, use_paragraphs) for unit in units]
+        for i, key in enumerate(cache_keys):
+            if i not in resolved:
+                cached = cache.get(key)
+                if cached is not None:
+                    resolved[i] = cached
+    
+    # Repeated units share one analysis: aliases maps a unit to the units reusing its result
+    aliases = {}
+    
+    # Identical units (ignoring case and whitespace) are analyzed once
+    first_of = {}
+    for i in range(len(units)):
+        if i in resolved:
+            continue
+        key = " ".join(units[i].split()).lower()
+        if key in first_of:
+            aliases.setdefault(first_of[key], []).append(i)
+        else:
+            first_of[key] = i
+    pending = list(first_of.values())
+    
+    # Near-duplicates are matched by embedding similarity
+    if semantic_cache is not None and pending:
+        semantic_hits, semantic_aliases = semantic_cache.assign([units[i] for i in pending])
+        for j, analysis in semantic_hits.items():
+            resolved[pending[j]] = analysis
+        for j, representative in semantic_aliases.items():
+            aliases.setdefault(pending[representative], []).append(pending[j])
+        pending = [i for j, i in enumerate(pending) if j not in semantic_hits and j not in semantic_aliases]
+    
+    for i, analysis in resolved.items():
+        for k in _with_aliases(i, aliases):
+            yield k, analysis
+    
+    if not pending:
+        return
+    
+    pending_units = [units[i] for i in pending]
+    if backend == "async":
+        results = _iterate_in_background(
+            lambda: analyze_all(pending_units, api_key=api_key, model_name=model_name, use_paragraphs=use_paragraphs, concurrency=concurrency, requests_per_minute=requests_per_minute)
+        )
+    elif backend == "thread":
+        results = analyze_batch_threaded(pending_units, api_key=api_key, model_name=model_name, use_paragraphs=use_paragraphs, max_workers=max_workers, requests_per_minute=requests_per_minute)
+    else:
+        results = _iterate_batch(pending_units, api_key, model_name, use_paragraphs)
+    
+    # Representatives whose embedding the semantic cache still holds
+    unstored = set(pending)
+    try:
+        # Indices yielded by the backends refer to pending_units
+        for j, analysis in results:
+            i = pending[j]
+            unstored.discard(i)
+            
+            # Only store real Gemini verdicts, not reused or prescreened ones;
+            # duplicates are stored under their own keys so later runs hit them too
+            if not is_error_result(analysis):
+                if cache is not None:
+                    for k in _with_aliases(i, aliases):
+                        cache.put(cache_keys[k], analysis)
+                if semantic_cache is not None:
+                    semantic_cache.add(units[i], analysis)
+            elif semantic_cache is not None:
+                semantic_cache.discard(units[i])
+            
+            for k in _with_aliases(i, aliases):
+                yield k, analysis
+    finally:
+        # Release embeddings of units never analyzed, e.g. when the caller stops early
+        if semantic_cache is not None:
+            for i in unstored:
+                semantic_cache.discard(units[i])
+
+
+def analyze_batch(
+    items: List[str],
+    api_key: str,
+    progress_callback=None,
+    model_name: str = "gemini-2.5-flash",
+    use_paragraphs: bool = True,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    use_threads: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    use_prescreen: bool = False,
+    cache: Optional[ResultCache] = None,
+    requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE
+) -> List[Dict]:
     """
     Analyze multiple items (sentences or paragraphs) in batch
     
+    Runs the same pipeline as analyze_stream: requests are sent
+    concurrently, with at most `concurrency` in flight (or `max_workers`
+    with use_threads), and items analyzed before, or repeated within the
+    batch, are only sent once. Progress is reported as each item resolves.
+    
     Args:
         items: List of text items to analyze
         api_key: Google Gemini API key
         progress_callback: Optional callback function for progress updates
         model_name: Gemini model to use
         use_paragraphs: If True, use paragraph analysis; if False, use sentence analysis
+        concurrency: Maximum number of requests in flight at once
+        use_threads: Send requests from a thread pool instead of an event loop
+        max_workers: Number of worker threads when use_threads is set
+        use_prescreen: Mark clearly concrete items as clear without calling Gemini
+        cache: ResultCache to use instead of the module-wide one
+        requests_per_minute: Maximum number of requests started per minute
         
     Returns:
-        List of analysis results
+        List of analysis results, in the same order as items
     """
-    results = []
-    total = len(items)
-    analyze_func = analyze_paragraph if use_paragraphs else analyze_sentence
+    results = [None] * len(items)
+    done = 0
     
-    for i, item in enumerate(items):
-        result = analyze_func(item, api_key=api_key, model_name=model_name)
-        results.append(result)
+    stream = analyze_stream(
+        items,
+        api_key=api_key,
+        model_name=model_name,
+        use_paragraphs=use_paragraphs,
+        backend="thread" if use_threads else "async",
+        use_prescreen=use_prescreen,
+        cache=_memo if cache is None else cache,
+        concurrency=concurrency,
+        max_workers=max_workers,
+        requests_per_minute=requests_per_minute
+    )
+    
+    for i, result in stream:
+        # Duplicates share one analysis; each index gets its own copy
+        results[i] = dict(result)
+        done += 1
         
         # Update progress if callback provided
         if progress_callback:
-            progress_callback(i + 1, total)
+            progress_callback(done, len(items))
     
     return results
+
+
+def iter_analyze_batch(items: Iterable[str], api_key: str, model_name: str = "gemini-2.5-flash", use_paragraphs: bool = True, max_workers: int = DEFAULT_MAX_WORKERS, requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE) -> Iterator[Tuple[int, Dict]]:
+    """
+    Analyze items as they arrive, yielding each result as soon as it completes
+    
+    Unlike analyze_batch, items may come from a lazy iterable such as
+    iter_sentences, so the first requests are in flight before the
+    input is exhausted. Shares the result cache of analyze_batch.
+    
+    Args:
+        items: Iterable of text items to analyze
+        api_key: Google Gemini API key
+        model_name: Gemini model to use
+        use_paragraphs: If True, use paragraph analysis; if False, use sentence analysis
+        max_workers: Number of worker threads (requests in flight at once)
+        requests_per_minute: Maximum number of requests started per minute
+        
+    Yields:
+        Tuples of (position in items, analysis result) in completion order
+    """
+    return analyze_batch_threaded(items, api_key=api_key, model_name=model_name, use_paragraphs=use_paragraphs, max_workers=max_workers, cache=_memo, requests_per_minute=requests_per_minute)